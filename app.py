@@ -1,337 +1,148 @@
 import streamlit as st
-import pandas as pd
-import io
-import requests
-import os
-from datetime import datetime
-
-# Import ReportLab modules
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-
-# --- Constants for PDF Report (Customized from Wind Load Calculator) ---
-# Company details from the provided Wind Load Calculator app
-LOGO_URL = "https://drive.google.com/uc?export=download&id=1VebdT2loVGX57noP9t2GgQhwCNn8AA3h"
-FALLBACK_LOGO_URL = "https://onedrive.live.com/download?cid=A48CC9068E3FACE0&resid=A48CC9068E3FACE0%21s252b6fb7fcd04f53968b2a09114d33ed" 
-COMPANY_NAME = "tekhne Consulting Engineers"
-COMPANY_ADDRESS = "" # Changed to empty string for cleaner handling
-PROGRAM = "Rebar Calc App" # Keeping this specific to the Rebar app
-PROGRAM_VERSION = "1.0"
+import numpy as np
+from collections import namedtuple
+from itertools import chain
+from types import MappingProxyType
+
+# Numba is optional; without it the weight kernel runs as plain NumPy
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@st.cache_resource
+def _load_rebar():
+    """Build the rebar lookup tables once per process instead of on every script rerun."""
+    # Define Australian rebar sizes and their nominal mass per meter (kg/m)
+    # Based on common Australian standards (e.g., AS/NZS 4671)
+    weights = {
+        "N10": 0.617,
+        "N12": 0.888,
+        "N16": 1.579,
+        "N20": 2.466,
+        "N24": 3.551,
+        "N28": 4.834,
+        "N32": 6.313,
+        "N36": 7.990,
+        "N40": 9.865,
+        "N50": 15.420, # Added N50 as it's also common
+    }
+    sizes = tuple(weights.keys()) # Selectbox options
+    # Read-only view, since cache_resource shares this object across all sessions
+    return MappingProxyType(weights), sizes
 
-# Define Australian rebar sizes and their nominal mass per meter (kg/m)
-# Based on common Australian standards (e.g., AS/NZS 4671)
-REBAR_WEIGHTS = {
-    "N10": 0.617,
-    "N12": 0.888,
-    "N16": 1.579,
-    "N20": 2.466,
-    "N24": 3.551,
-    "N28": 4.834,
-    "N32": 6.313,
-    "N36": 7.990,
-    "N40": 9.865,
-    "N50": 15.420, # Added N50 as it's also common
-}
+REBAR_WEIGHTS, REBAR_SIZES = _load_rebar()
 
-# --- Helper Function to Calculate Bar Weight ---
-def calculate_bar_weight(bar_size, quantity, length_per_bar_m):
+# --- Batched Weight Kernel ---
+@njit(cache=True, fastmath=True)
+def _aggregate(unit_weights, qtys, lengths):
     """
-    Calculates the total weight for a given bar size, quantity, and length.
+    Computes per-row total lengths and weights for a batch of bars.
     Args:
-        bar_size (str): The size of the rebar (e.g., "N12").
-        quantity (int): The number of bars.
-        length_per_bar_m (float): The length of a single bar in meters.
+        unit_weights (np.ndarray): Unit weight of each row in kg/m.
+        qtys (np.ndarray): Number of bars in each row.
+        lengths (np.ndarray): Length of a single bar in each row in meters.
     Returns:
-        tuple: (Total weight in kg, Unit weight in kg/m, Total length in m)
+        tuple: (Total length per row in m, Total weight per row in kg, Sum of weights in kg)
     """
-    if bar_size not in REBAR_WEIGHTS:
-        st.error(f"Error: Bar size '{bar_size}' not recognized.")
-        return 0.0, 0.0, 0.0 # Return all zeros if size is not recognized
-    
-    if quantity < 0 or length_per_bar_m < 0:
-        st.warning(f"Quantity ({quantity}) and length ({length_per_bar_m}) cannot be negative for {bar_size}. Skipping calculation for this item.")
-        return 0.0, REBAR_WEIGHTS[bar_size], 0.0 # Return 0 weight, but correct unit weight
-
-    unit_weight = REBAR_WEIGHTS[bar_size]
-    total_length = quantity * length_per_bar_m
-    total_weight = total_length * unit_weight
-    return total_weight, unit_weight, total_length
-
-# --- PDF Report Functions ---
-# This function is used to download the logo to a local file for ReportLab
-def download_logo():
-    """Download company logo for PDF report."""
-    logo_file = None
-    for url in [LOGO_URL, FALLBACK_LOGO_URL]:
-        try:
-            response = requests.get(url, stream=True, timeout=10)
-            if response.status_code == 200:
-                logo_file = "company_logo.png"
-                with open(logo_file, 'wb') as f:
-                    f.write(response.content)
-                break
-        except Exception:
-            # Catch all exceptions during download attempts
-            pass
-    return logo_file if logo_file and os.path.exists(logo_file) else None
+    total_lengths = qtys.astype(np.float64) * lengths
+    total_weights = total_lengths * unit_weights
+    return total_lengths, total_weights, total_weights.sum()
 
-# Helper function to draw header/footer on each page of the PDF
-def _draw_header_footer(canvas, doc):
-    canvas.saveState()
-    
-    # Draw Header (Company Name and Address)
-    canvas.setFont('Helvetica-Bold', 10)
-    canvas.drawString(60*mm, A4[1] - 15*mm, COMPANY_NAME)
-    canvas.setFont('Helvetica', 8)
-    canvas.drawString(60*mm, A4[1] - 20*mm, COMPANY_ADDRESS)
-    
-    # Draw Logo
-    logo_file = "company_logo.png" # Assuming it was downloaded by generate_pdf_report
-    if os.path.exists(logo_file):
-        try:
-            logo = Image(logo_file, width=40*mm, height=15*mm)
-            logo.drawOn(canvas, 15*mm, A4[1] - 25*mm) # Position logo at top-left
-        except Exception:
-            pass # Ignore if image drawing fails
-    
-    # Draw Footer
-    canvas.setFont('Helvetica', 8)
-    footer_text = f"{PROGRAM} {PROGRAM_VERSION} | {COMPANY_NAME} © | Page {doc.page}"
-    canvas.drawCentredString(A4[0]/2.0, 10*mm, footer_text)
-    
-    canvas.restoreState()
+# --- Cached Calculation Helpers ---
+# One row of the weight summary, in the same order as the summary table columns
+CalcRow = namedtuple("CalcRow", ["Component", "BarSize", "Quantity", "LengthPerBar", "TotalLength", "UnitWeight", "TotalWeight"])
 
-# Main PDF generation function
-def generate_pdf_report(calculation_data, total_weight, cage_type, project_name, project_number, cage_designation, input_details):
-    """Generate a professional PDF report with company branding and header on all pages."""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                            leftMargin=15*mm, rightMargin=15*mm,
-                            topMargin=20*mm, bottomMargin=15*mm) # Reduced top margin
-    
-    styles = getSampleStyleSheet()
-    
-    # Custom styles (adopted from Wind Load Calculator)
-    title_style = ParagraphStyle(
-        name='TitleStyle',
-        parent=styles['Title'],
-        fontSize=14, # Reduced from 16
-        leading=18,
-        alignment=TA_CENTER,
-        spaceAfter=8 # Reduced from 12
-    )
-    
-    subtitle_style = ParagraphStyle(
-        name='SubtitleStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_CENTER,
-        spaceAfter=15
-    )
-    
-    heading_style = ParagraphStyle( # Renamed from heading1_style for clarity
-        name='HeadingStyle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        spaceBefore=20,
-        spaceAfter=10
-    )
-    
-    heading2_style = ParagraphStyle(
-        name='Heading2',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceBefore=15,
-        spaceAfter=8
-    )
-    
-    heading3_style = ParagraphStyle(
-        name='Heading3',
-        parent=styles['Heading3'],
-        fontSize=11, # Reduced from 12
-        spaceAfter=4 # Reduced from 6
-    )
-    
-    normal_style = ParagraphStyle(
-        name='NormalStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=12,
-        spaceAfter=8
-    )
-    
-    bold_style = ParagraphStyle(name='BoldStyle', parent=styles['Normal'], fontSize=9, spaceAfter=4, fontName='Helvetica-Bold') # Added
-    justified_style = ParagraphStyle(name='JustifiedStyle', parent=styles['Normal'], fontSize=9, spaceAfter=4, alignment=TA_JUSTIFY) # Added
+def bar_inputs_to_tuple(bar_inputs):
+    """Convert a list of bar input dicts into a hashable tuple of (size, unit_weight, qty, length) rows."""
+    return tuple((item["size"], item["unit_weight"], item["qty"], item["length"]) for item in bar_inputs)
 
-    table_header_style = ParagraphStyle(
-        name='TableHeaderStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=12,
-        fontName='Helvetica-Bold',
-        alignment=TA_CENTER
-    )
-    
-    table_cell_style = ParagraphStyle(
-        name='TableCellStyle',
-        parent=styles['Normal'],
-        fontSize=8, # Reduced from 9
-        leading=9, # Reduced from 11
-        alignment=TA_LEFT
-    )
-    
-    table_cell_center_style = ParagraphStyle(
-        name='TableCellCenter',
-        parent=styles['Normal'],
-        fontSize=8, # Reduced from 9
-        leading=9, # Reduced from 11
-        alignment=TA_CENTER
-    )
-    
-    elements = []
-
-    # Attempt to download logo once before building the document
-    download_logo() 
-    
-    # Title and project info
-    elements.append(Paragraph(f"Concrete Reinforcement Cage Weight Report", title_style))
-    elements.append(Paragraph(f"for {cage_type}", subtitle_style))
-    
-    # Project Info
-    project_info_text = (
-        f"<b>Project:</b> {project_name}<br/>"
-        f"<b>Number:</b> {project_number}<br/>"
-        f"<b>Cage Designation:</b> {cage_designation}<br/>" # Added Cage Designation
-        f"<b>Date:</b> {datetime.now().strftime('%d %B %Y')}"
-    )
-    elements.append(Paragraph(project_info_text, normal_style))
-    elements.append(Spacer(1, 8*mm))
-    
-    # --- Introduction Section ---
-    elements.append(Paragraph("Introduction", heading_style))
-    intro_text = (
-        "This report provides a detailed calculation of the total weight for the specified concrete reinforcement cage. "
-        "The calculations are based on standard nominal mass per meter values for Australian reinforcing steel, "
-        "ensuring compliance with local standards. This document summarizes the input parameters provided and "
-        "presents the calculated weights for each component, culminating in the total estimated cage weight."
-    )
-    elements.append(Paragraph(intro_text, justified_style))
-    elements.append(Spacer(1, 4*mm))
-
-    # --- Input Details Section ---
-    elements.append(Paragraph("Input Details", heading_style))
-    
-    input_data_table_content = [
-        [
-            Paragraph("Component Type", table_header_style),
-            Paragraph("Bar Size", table_header_style),
-            Paragraph("Quantity", table_header_style),
-            Paragraph("Length per Bar (m)", table_header_style)
-        ]
-    ]
-
-    # Dynamically add input details to the table
-    component_name_map = {
-        "vertical_bars": "Vertical Bars",
-        "horizontal_bars": "Horizontal Bars",
-        "links": "Links/Ties"
+@st.cache_data
+def build_summary(vert, horiz, link):
+    """
+    Builds the weight calculation summary for a wall cage.
+    Cached by Streamlit so unchanged inputs skip recalculation on reruns.
+    Args:
+        vert (tuple): (size, unit_weight, qty, length) rows for the vertical bars.
+        horiz (tuple): (size, unit_weight, qty, length) rows for the horizontal bars.
+        link (tuple): (size, unit_weight, qty, length) rows for the links/ties.
+    Returns:
+        tuple: (Dict of column lists for display, Total weight in kg)
+    """
+    components = [("Vertical Bars", vert), ("Horizontal Bars", horiz), ("Links", link)]
+    labels = [(name, i) for name, items in components for i in range(len(items))]
+    all_inputs = vert + horiz + link
+    n = len(all_inputs)
+
+    # Compute every row in one vectorized pass instead of per-row Python calls
+    unit_weights = np.fromiter((unit_weight for _, unit_weight, _, _ in all_inputs), dtype=np.float64, count=n)
+    qtys = np.fromiter((qty for _, _, qty, _ in all_inputs), dtype=np.int64, count=n)
+    lens = np.fromiter((length for _, _, _, length in all_inputs), dtype=np.float64, count=n)
+    mask = (qtys > 0) & (lens > 0) # Only keep rows where quantity and length are positive
+    total_lengths, total_weights, total_cage_weight = _aggregate(unit_weights, np.where(mask, qtys, 0), lens)
+
+    # Build the table column-wise (one list per column) for display
+    rows = np.flatnonzero(mask)
+    table = {
+        "Component": [f"{labels[k][0]} (Type {labels[k][1]+1})" for k in rows],
+        "Bar Size": [all_inputs[k][0] for k in rows],
+        "Quantity": qtys[rows].tolist(),
+        "Length per Bar (m)": lens[rows].tolist(),
+        "Total Length (m)": total_lengths[rows].tolist(),
+        "Unit Weight (kg/m)": unit_weights[rows].tolist(),
+        "Total Weight (kg)": total_weights[rows].tolist()
     }
 
-    for category, items in input_details.items():
-        for i, item in enumerate(items):
-            # Only add to report if quantity or length is greater than 0
-            if item["qty"] > 0 or item["length"] > 0: 
-                row_component = f"{component_name_map.get(category, category.replace('_', ' ').title())} (Type {i+1})"
-                row_bar_size = item["size"]
-                row_quantity = str(item["qty"]) # Ensure quantity is string for Paragraph
-                row_length = f"{item['length']:.2f}"
-                input_data_table_content.append([
-                    Paragraph(row_component, table_cell_style),
-                    Paragraph(row_bar_size, table_cell_center_style),
-                    Paragraph(row_quantity, table_cell_center_style), 
-                    Paragraph(row_length, table_cell_center_style)
-                ])
-    
-    if len(input_data_table_content) > 1: # Check if there's actual data beyond headers
-        input_table = Table(input_data_table_content, colWidths=[60*mm, 35*mm, 35*mm, 40*mm])
-        input_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'), # Left align for component type
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'), # Center align for Bar Size, Quantity, Length
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        elements.append(input_table)
-    else:
-        elements.append(Paragraph("No input details were provided.", normal_style))
+    return table, float(total_cage_weight)
 
-    elements.append(Spacer(1, 8*mm))
-    
-    # --- Weight Calculation Summary Section ---
-    elements.append(Paragraph("Weight Calculation Summary", heading_style))
-    
-    if calculation_data:
-        # Prepare data for the table
-        table_data = [
-            [
-                Paragraph("Component", table_header_style),
-                Paragraph("Bar Size", table_header_style),
-                Paragraph("Quantity", table_header_style),
-                Paragraph("Length per Bar (m)", table_header_style),
-                Paragraph("Total Length (m)", table_header_style),
-                Paragraph("Unit Weight (kg/m)", table_header_style),
-                Paragraph("Total Weight (kg)", table_header_style)
-            ]
-        ]
-        
-        for row in calculation_data:
-            table_data.append([
-                Paragraph(str(row.get("Component", "")), table_cell_style),
-                Paragraph(str(row.get("Bar Size", "")), table_cell_center_style),
-                Paragraph(str(row.get("Quantity", 0)), table_cell_center_style),
-                # Using .get() here to safely retrieve the value and prevent KeyError
-                Paragraph(f"{row.get('Length per Bar (m)', 0.0):.2f}", table_cell_center_style), 
-                Paragraph(f"{row.get('Total Length (m)', 0.0):.2f}", table_cell_center_style),
-                Paragraph(f"{row.get('Unit Weight (kg/m)', 0.0):.3f}", table_cell_center_style),
-                Paragraph(f"{row.get('Total Weight (kg)', 0.0):.2f}", table_cell_center_style)
-            ])
-            
-        summary_table = Table(table_data, colWidths=[40*mm, 20*mm, 20*mm, 25*mm, 25*mm, 25*mm, 25*mm])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'), # Left align for component
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'), # Center align for numeric columns
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        elements.append(summary_table)
-        elements.append(Spacer(1, 6*mm))
-        elements.append(Paragraph(f"**Total Estimated {cage_type} Weight: {total_weight:.2f} kg**", heading2_style))
-    else:
-        elements.append(Paragraph("No bar details were entered for calculation.", normal_style))
+# --- UI Helper Function for Bar Inputs ---
+# Wall cage input sections: (title, type label, widget key prefix, length label, is link)
+# Links take their perimeter as the length and show it before the quantity.
+WALL_CAGE_CATEGORIES = (
+    ("Vertical Bars", "Vertical Bar", "vert", "Length per Bar (m)", False),
+    ("Horizontal Bars", "Horizontal Bar", "horiz", "Length per Bar (m)", False),
+    ("Links/Ties (for maintaining spacing)", "Link", "link", "Length of Each Link (m) (Perimeter)", True),
+)
 
-    # Build the document with header and footer on all pages
-    doc.build(elements, onFirstPage=_draw_header_footer, onLaterPages=_draw_header_footer)
-    buffer.seek(0)
-    return buffer
+def render_bar_inputs(title, type_label, prefix, length_label, length_first=False, options=REBAR_SIZES):
+    """
+    Renders the size/quantity/length widgets for up to 3 bar types of one component.
+    Args:
+        title (str): Subheader shown above the inputs (e.g., "Vertical Bars").
+        type_label (str): Label for each bar type row (e.g., "Vertical Bar").
+        prefix (str): Widget key prefix (e.g., "vert").
+        length_label (str): Label for the length input.
+        length_first (bool): Show the length input before the quantity input.
+        options (tuple): Bar sizes offered in the selectbox.
+    Returns:
+        list: A dict with "size", "unit_weight", "qty" and "length" for each bar type.
+    """
+    st.subheader(title)
+    rows = []
+    for i in range(3): # Allow for up to 3 different bar types
+        st.markdown(f"**{type_label} Type {i+1}**")
+        col1, col2, col3 = st.columns(3)
+        qty_col, length_col = (col3, col2) if length_first else (col2, col3)
+        with col1:
+            size = st.selectbox(f"Size (Type {i+1}):", options, key=f"{prefix}_size_{i}", index=0)
+        with qty_col:
+            qty = st.number_input(f"Quantity (Type {i+1}):", min_value=0, value=0, step=1, key=f"{prefix}_qty_{i}")
+        with length_col:
+            length = st.number_input(f"{length_label} (Type {i+1}):", min_value=0.0, value=0.0, step=0.1, key=f"{prefix}_length_{i}")
+        # Capture the unit weight here so the calculation needs no size lookups
+        rows.append({"size": size, "unit_weight": REBAR_WEIGHTS[size], "qty": qty, "length": length})
+    return rows
+
+# Display formats for the numeric columns of the weight summary table
+SUMMARY_FORMATS = {
+    "Length per Bar (m)": "{:.2f}",
+    "Total Length (m)": "{:.2f}",
+    "Unit Weight (kg/m)": "{:.3f}",
+    "Total Weight (kg)": "{:.2f}",
+}
 
 # --- Streamlit Application UI ---
 st.set_page_config(page_title="Concrete Reinforcement Cage Weight Calculator", layout="centered")
@@ -357,138 +168,55 @@ st.markdown("---")
 if cage_type == "Wall Cage":
     st.header("🧱 Wall Cage Details")
 
-    # --- Vertical Bars Input ---
-    st.subheader("Vertical Bars")
-    vertical_bar_inputs = []
-    for i in range(3): # Allow for up to 3 different vertical bar types
-        st.markdown(f"**Vertical Bar Type {i+1}**")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            size = st.selectbox(f"Size (Type {i+1}):", list(REBAR_WEIGHTS.keys()), key=f"vert_size_{i}", index=0 if i == 0 else 0)
-        with col2:
-            qty = st.number_input(f"Quantity (Type {i+1}):", min_value=0, value=0, step=1, key=f"vert_qty_{i}")
-        with col3:
-            length = st.number_input(f"Length per Bar (m) (Type {i+1}):", min_value=0.0, value=0.0, step=0.1, key=f"vert_length_{i}")
-        vertical_bar_inputs.append({"size": size, "qty": qty, "length": length})
-    
-    # --- Horizontal Bars Input ---
-    st.subheader("Horizontal Bars")
-    horizontal_bar_inputs = []
-    for i in range(3): # Allow for up to 3 different horizontal bar types
-        st.markdown(f"**Horizontal Bar Type {i+1}**")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            size = st.selectbox(f"Size (Type {i+1}):", list(REBAR_WEIGHTS.keys()), key=f"horiz_size_{i}", index=0 if i == 0 else 0)
-        with col2:
-            qty = st.number_input(f"Quantity (Type {i+1}):", min_value=0, value=0, step=1, key=f"horiz_qty_{i}")
-        with col3:
-            length = st.number_input(f"Length per Bar (m) (Type {i+1}):", min_value=0.0, value=0.0, step=0.1, key=f"horiz_length_{i}")
-        horizontal_bar_inputs.append({"size": size, "qty": qty, "length": length})
-
-    # --- Links/Ties Input ---
-    st.subheader("Links/Ties (for maintaining spacing)")
-    link_bar_inputs = []
-    for i in range(3): # Allow for up to 3 different link types
-        st.markdown(f"**Link Type {i+1}**")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            size = st.selectbox(f"Size (Type {i+1}):", list(REBAR_WEIGHTS.keys()), key=f"link_size_{i}", index=0 if i == 0 else 0)
-        with col2:
-            # Assuming length of link is its perimeter
-            length = st.number_input(f"Length of Each Link (m) (Perimeter) (Type {i+1}):", min_value=0.0, value=0.0, step=0.1, key=f"link_length_{i}")
-        with col3:
-            qty = st.number_input(f"Quantity (Type {i+1}):", min_value=0, value=0, step=1, key=f"link_qty_{i}")
-        link_bar_inputs.append({"size": size, "qty": qty, "length": length})
-    
-    st.markdown("---")
-
-    if st.button("Calculate Wall Cage Weight"):
-        st.subheader("Weight Calculation Summary")
+    # Batch all input edits in a form so the script only reruns on submit
+    with st.form("wall_cage_form"):
+        bar_inputs = {
+            key_prefix: render_bar_inputs(title, type_label, key_prefix, length_label, length_first=is_link)
+            for title, type_label, key_prefix, length_label, is_link in WALL_CAGE_CATEGORIES
+        }
         
-        calculation_data = []
-        total_cage_weight = 0.0
+        st.markdown("---")
+        submit = st.form_submit_button("Calculate Wall Cage Weight")
 
-        # Calculate Vertical Bars weight for all types
-        for i, bar_input in enumerate(vertical_bar_inputs):
-            if bar_input["qty"] > 0 and bar_input["length"] > 0: # Only calculate if quantity and length are positive
-                vert_weight, vert_unit_weight, vert_total_length = calculate_bar_weight(
-                    bar_input["size"], bar_input["qty"], bar_input["length"]
-                )
-                calculation_data.append({
-                    "Component": f"Vertical Bars (Type {i+1})",
-                    "Bar Size": bar_input["size"],
-                    "Quantity": bar_input["qty"],
-                    "Length per Bar (m)": bar_input["length"],
-                    "Total Length (m)": vert_total_length,
-                    "Unit Weight (kg/m)": vert_unit_weight,
-                    "Total Weight (kg)": vert_weight
-                })
-                total_cage_weight += vert_weight
-
-        # Calculate Horizontal Bars weight for all types
-        for i, bar_input in enumerate(horizontal_bar_inputs):
-            if bar_input["qty"] > 0 and bar_input["length"] > 0: # Only calculate if quantity and length are positive
-                horiz_weight, horiz_unit_weight, horiz_total_length = calculate_bar_weight(
-                    bar_input["size"], bar_input["qty"], bar_input["length"]
-                )
-                calculation_data.append({
-                    "Component": f"Horizontal Bars (Type {i+1})",
-                    "Bar Size": bar_input["size"],
-                    "Quantity": bar_input["qty"],
-                    "Length per Bar (m)": bar_input["length"],
-                    "Total Length (m)": horiz_total_length,
-                    "Unit Weight (kg/m)": horiz_unit_weight,
-                    "Total Weight (kg)": horiz_weight
-                })
-                total_cage_weight += horiz_weight
-
-        # Calculate Links weight for all types
-        for i, bar_input in enumerate(link_bar_inputs):
-            if bar_input["qty"] > 0 and bar_input["length"] > 0: # Only calculate if quantity and length are positive
-                link_weight, link_unit_weight, link_total_length = calculate_bar_weight(
-                    bar_input["size"], bar_input["qty"], bar_input["length"]
-                )
-                calculation_data.append({
-                    "Component": f"Links (Type {i+1})",
-                    "Bar Size": bar_input["size"],
-                    "Quantity": bar_input["qty"],
-                    "Length per Link (m) (Perimeter)": bar_input["length"],
-                    "Total Length (m)": link_total_length,
-                    "Unit Weight (kg/m)": link_unit_weight,
-                    "Total Weight (kg)": link_weight
-                })
-                total_cage_weight += link_weight
+    if submit:
+        st.subheader("Weight Calculation Summary")
         
-        # Display the table
-        if calculation_data:
-            df = pd.DataFrame(calculation_data)
-            st.dataframe(df.round(2), use_container_width=True) # Round to 2 decimal places for display
+        # Only calculate if some bar has a positive quantity and length
+        if any(b["qty"] > 0 and b["length"] > 0 for b in chain.from_iterable(bar_inputs.values())):
+            table, total_cage_weight = build_summary(
+                bar_inputs_to_tuple(bar_inputs["vert"]),
+                bar_inputs_to_tuple(bar_inputs["horiz"]),
+                bar_inputs_to_tuple(bar_inputs["link"])
+            )
+            # Rows are built outside the cached function: Streamlit cannot pickle classes defined in the script
+            calculation_data = [CalcRow(*values) for values in zip(*table.values())]
+            
+            # Display the table as a static st.table of pre-formatted strings (no interactive grid for ≤9 rows)
+            st.table({
+                col: list(map(SUMMARY_FORMATS[col].format, values)) if col in SUMMARY_FORMATS else values
+                for col, values in table.items()
+            })
             st.success(f"**Total Estimated Wall Cage Weight: {total_cage_weight:.2f} kg**")
             
             # --- PDF Report Download Button ---
             st.markdown("---")
             st.subheader("Generate Report")
             
-            # Collect input details for the PDF report
-            input_details = {
-                "vertical_bars": vertical_bar_inputs,
-                "horizontal_bars": horizontal_bar_inputs,
-                "links": link_bar_inputs
-            }
-
-            pdf_buffer = generate_pdf_report(
-                calculation_data, 
-                total_cage_weight, 
-                cage_type, 
-                project_name, 
-                project_number,
-                cage_designation, # Pass the new cage_designation
-                input_details
-            )
+            # ReportLab is only imported once a report is actually needed
+            from report import generate_pdf_report
+            with st.spinner("Building PDF report..."):
+                pdf_bytes = generate_pdf_report(
+                    calculation_data, 
+                    total_cage_weight, 
+                    cage_type, 
+                    project_name, 
+                    project_number,
+                    cage_designation # Pass the new cage_designation
+                )
             
             st.download_button(
                 label="Download PDF Report",
-                data=pdf_buffer,
+                data=pdf_bytes,
                 file_name=f"Rebar_Cage_Report_{project_number}.pdf",
                 mime="application/pdf"
             )
@@ -0,0 +1,418 @@
+# PDF report generation for the Rebar Calc App.
+# app.py imports this module only when a report is needed, keeping ReportLab out of app start-up.
+import streamlit as st
+import io
+import functools
+import requests
+import threading
+import time
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+# Import ReportLab modules
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.lib import colors
+from reportlab.lib.utils import ImageReader
+
+# --- Constants for PDF Report (Customized from Wind Load Calculator) ---
+# Company details from the provided Wind Load Calculator app
+LOGO_URL = "https://drive.google.com/uc?export=download&id=1VebdT2loVGX57noP9t2GgQhwCNn8AA3h"
+FALLBACK_LOGO_URL = "https://onedrive.live.com/download?cid=A48CC9068E3FACE0&resid=A48CC9068E3FACE0%21s252b6fb7fcd04f53968b2a09114d33ed" 
+COMPANY_NAME = "tekhne Consulting Engineers"
+COMPANY_ADDRESS = "" # Changed to empty string for cleaner handling
+PROGRAM = "Rebar Calc App" # Keeping this specific to the Rebar app
+PROGRAM_VERSION = "1.0"
+
+# --- PDF Report Functions ---
+# The logo is kept in memory for the process and revalidated at most hourly.
+# Revalidation sends If-Modified-Since, so an unchanged logo costs a 304 with no body.
+# A failed download is retried after a short backoff rather than waiting out the full hour.
+_LOGO_TTL_S = 3600
+_LOGO_RETRY_S = 60
+_LOGO_CACHE = {"content": None, "url": None, "last_modified": None, "expires_at": None}
+_LOGO_LOCK = threading.Lock() # Guards _LOGO_CACHE; never held during network I/O
+_LOGO_FETCH_LOCK = threading.Lock() # Held by the one thread downloading the logo
+_SESSION = requests.Session() # Pooled connections, reused across revalidations (used under _LOGO_FETCH_LOCK)
+
+def _logo_if_fresh():
+    """Return (is_fresh, cached logo bytes or None)."""
+    with _LOGO_LOCK:
+        expires_at = _LOGO_CACHE["expires_at"]
+        return expires_at is not None and time.monotonic() < expires_at, _LOGO_CACHE["content"]
+
+def get_logo_bytes():
+    """Return the company logo bytes for the PDF report (downloading or revalidating when due), or None."""
+    is_fresh, content = _logo_if_fresh()
+    if is_fresh:
+        return content
+
+    # Only one thread downloads. Others keep using a stale logo if there is one, otherwise they wait.
+    if not _LOGO_FETCH_LOCK.acquire(blocking=content is None):
+        return content
+    try:
+        is_fresh, content = _logo_if_fresh() # Another thread may have just finished a download
+        if is_fresh:
+            return content
+        with _LOGO_LOCK:
+            cached_url, last_modified = _LOGO_CACHE["url"], _LOGO_CACHE["last_modified"]
+
+        ttl = _LOGO_RETRY_S # Unless a download below succeeds
+        for url in [LOGO_URL, FALLBACK_LOGO_URL]:
+            headers = {}
+            if url == cached_url and last_modified:
+                headers["If-Modified-Since"] = last_modified
+            try:
+                response = _SESSION.get(url, headers=headers, timeout=10)
+            except Exception:
+                # Catch all exceptions during download attempts
+                continue
+            if response.status_code == 304: # Cached copy is still current
+                ttl = _LOGO_TTL_S
+                break
+            if response.status_code == 200:
+                with _LOGO_LOCK:
+                    _LOGO_CACHE.update(content=response.content, url=url,
+                                       last_modified=response.headers.get("Last-Modified"))
+                ttl = _LOGO_TTL_S
+                break
+
+        with _LOGO_LOCK:
+            _LOGO_CACHE["expires_at"] = time.monotonic() + ttl
+            return _LOGO_CACHE["content"]
+    finally:
+        _LOGO_FETCH_LOCK.release()
+
+# Fixed header/footer positions on the A4 page
+_A4_W, _A4_H = A4
+_HEADER_X = 60*mm
+_NAME_Y = _A4_H - 15*mm
+_ADDR_Y = _A4_H - 20*mm
+_LOGO_X = 15*mm
+_LOGO_Y = _A4_H - 25*mm
+_LOGO_W, _LOGO_H = 40*mm, 15*mm
+_CENTER_X = _A4_W / 2.0
+_FOOTER_Y = 10*mm
+_FOOTER_TMPL = f"{PROGRAM} {PROGRAM_VERSION} | {COMPANY_NAME} © | Page %d"
+
+# Page margins (the body frame sits inside these)
+_LEFT_MARGIN, _RIGHT_MARGIN = 15*mm, 15*mm
+_TOP_MARGIN, _BOTTOM_MARGIN = 20*mm, 15*mm # Reduced top margin
+
+@functools.lru_cache(maxsize=1)
+def _today_str(date_ordinal):
+    """Format today's date for the report; cached until the date ordinal changes."""
+    return datetime.fromordinal(date_ordinal).strftime('%d %B %Y')
+
+# Helper function to draw header/footer on each page of the PDF
+def _draw_header_footer(canvas, doc, logo=None):
+    canvas.saveState()
+    
+    # Draw Header (Company Name and Address)
+    canvas.setFont('Helvetica-Bold', 10)
+    canvas.drawString(_HEADER_X, _NAME_Y, COMPANY_NAME)
+    canvas.setFont('Helvetica', 8)
+    canvas.drawString(_HEADER_X, _ADDR_Y, COMPANY_ADDRESS)
+    
+    # Draw Logo (built once per report by generate_pdf_report)
+    if logo is not None:
+        try:
+            canvas.drawImage(logo, _LOGO_X, _LOGO_Y, width=_LOGO_W, height=_LOGO_H, mask='auto') # Position logo at top-left
+        except Exception:
+            pass # Ignore if image drawing fails
+    
+    # Draw Footer
+    canvas.setFont('Helvetica', 8)
+    canvas.drawCentredString(_CENTER_X, _FOOTER_Y, _FOOTER_TMPL % doc.page)
+    
+    canvas.restoreState()
+
+# --- PDF Report Styles (built once at import rather than per report) ---
+_STYLES = getSampleStyleSheet()
+
+# Custom styles (adopted from Wind Load Calculator)
+_TITLE_STYLE = ParagraphStyle(
+    name='TitleStyle',
+    parent=_STYLES['Title'],
+    fontSize=14, # Reduced from 16
+    leading=18,
+    alignment=TA_CENTER,
+    spaceAfter=8 # Reduced from 12
+)
+
+_SUBTITLE_STYLE = ParagraphStyle(
+    name='SubtitleStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    alignment=TA_CENTER,
+    spaceAfter=15
+)
+
+_HEADING_STYLE = ParagraphStyle( # Renamed from heading1_style for clarity
+    name='HeadingStyle',
+    parent=_STYLES['Heading1'],
+    fontSize=14,
+    spaceBefore=20,
+    spaceAfter=10
+)
+
+_HEADING2_STYLE = ParagraphStyle(
+    name='Heading2',
+    parent=_STYLES['Heading2'],
+    fontSize=12,
+    spaceBefore=15,
+    spaceAfter=8
+)
+
+_NORMAL_STYLE = ParagraphStyle(
+    name='NormalStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    leading=12,
+    spaceAfter=8
+)
+
+_JUSTIFIED_STYLE = ParagraphStyle(name='JustifiedStyle', parent=_STYLES['Normal'], fontSize=9, spaceAfter=4, alignment=TA_JUSTIFY) # Added
+
+_TABLE_HEADER_STYLE = ParagraphStyle(
+    name='TableHeaderStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    leading=12,
+    fontName='Helvetica-Bold',
+    alignment=TA_CENTER
+)
+
+_TABLE_CELL_STYLE = ParagraphStyle(
+    name='TableCellStyle',
+    parent=_STYLES['Normal'],
+    fontSize=8, # Reduced from 9
+    leading=9, # Reduced from 11
+    alignment=TA_LEFT
+)
+
+_INPUT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'), # Left align for component type
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'), # Center align for Bar Size, Quantity, Length
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+    ('LEFTPADDING', (0, 0), (-1, -1), 3),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+    ('FONTNAME', (1, 1), (-1, -1), 'Helvetica'), # Plain-string value cells
+    ('FONTSIZE', (1, 1), (-1, -1), 8),
+    ('LEADING', (1, 1), (-1, -1), 9),
+])
+
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'), # Left align for component
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'), # Center align for numeric columns
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+    ('LEFTPADDING', (0, 0), (-1, -1), 3),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+    ('FONTNAME', (1, 1), (-1, -1), 'Helvetica'), # Plain-string value cells
+    ('FONTSIZE', (1, 1), (-1, -1), 8),
+    ('LEADING', (1, 1), (-1, -1), 9),
+])
+
+# Static report text, parsed once. These Paragraphs are re-wrapped on every build, so the
+# same objects can be reused across reports, as long as only one build runs at a time.
+# _BUILD_LOCK enforces that, since layout stores its wrap state on the shared Paragraphs.
+_BUILD_LOCK = threading.Lock()
+
+_TITLE_PARAGRAPH = Paragraph("Concrete Reinforcement Cage Weight Report", _TITLE_STYLE)
+_INTRO_HEADING = Paragraph("Introduction", _HEADING_STYLE)
+_INTRO_PARAGRAPH = Paragraph(
+    "This report provides a detailed calculation of the total weight for the specified concrete reinforcement cage. "
+    "The calculations are based on standard nominal mass per meter values for Australian reinforcing steel, "
+    "ensuring compliance with local standards. This document summarizes the input parameters provided and "
+    "presents the calculated weights for each component, culminating in the total estimated cage weight.",
+    _JUSTIFIED_STYLE
+)
+_INPUT_HEADING = Paragraph("Input Details", _HEADING_STYLE)
+_SUMMARY_HEADING = Paragraph("Weight Calculation Summary", _HEADING_STYLE)
+_NO_INPUT_PARAGRAPH = Paragraph("No input details were provided.", _NORMAL_STYLE)
+_NO_BARS_PARAGRAPH = Paragraph("No bar details were entered for calculation.", _NORMAL_STYLE)
+
+# Table header rows (header cells never split, so they are reused the same way)
+_INPUT_HEADER_ROW = [
+    Paragraph("Component Type", _TABLE_HEADER_STYLE),
+    Paragraph("Bar Size", _TABLE_HEADER_STYLE),
+    Paragraph("Quantity", _TABLE_HEADER_STYLE),
+    Paragraph("Length per Bar (m)", _TABLE_HEADER_STYLE)
+]
+
+_SUMMARY_HEADER_ROW = [
+    Paragraph("Component", _TABLE_HEADER_STYLE),
+    Paragraph("Bar Size", _TABLE_HEADER_STYLE),
+    Paragraph("Quantity", _TABLE_HEADER_STYLE),
+    Paragraph("Length per Bar (m)", _TABLE_HEADER_STYLE),
+    Paragraph("Total Length (m)", _TABLE_HEADER_STYLE),
+    Paragraph("Unit Weight (kg/m)", _TABLE_HEADER_STYLE),
+    Paragraph("Total Weight (kg)", _TABLE_HEADER_STYLE)
+]
+
+# Helper to build the wrapping Component cell of each table row
+@functools.lru_cache(maxsize=256)
+def _escape_cell_text(text):
+    """Escape XML special characters once per distinct cell text."""
+    return escape(text)
+
+def _component_cell(text):
+    """Build the first-column Paragraph (only the text is cached; Platypus mutates Paragraphs during layout)."""
+    return Paragraph(_escape_cell_text(text), _TABLE_CELL_STYLE)
+
+# ReportLab's table layout grows super-linearly with row count, so long tables are split
+_MAX_TABLE_ROWS = 500
+
+def _split_table(rows, col_widths, style):
+    """
+    Builds one or more Tables from a header row plus body rows, at most _MAX_TABLE_ROWS body rows each.
+    Args:
+        rows (list): Header row followed by the body rows.
+        col_widths (list): Column widths passed to each Table.
+        style (TableStyle): Style applied to each Table.
+    Returns:
+        list: Flowables (Tables separated by small Spacers) to add to the story.
+    """
+    header, body = rows[0], rows[1:]
+    flowables = []
+    for start in range(0, max(len(body), 1), _MAX_TABLE_ROWS):
+        if flowables:
+            flowables.append(Spacer(1, 2*mm))
+        table = Table([header] + body[start:start + _MAX_TABLE_ROWS], colWidths=col_widths, repeatRows=1)
+        table.setStyle(style)
+        flowables.append(table)
+    return flowables
+
+# The report has no bookmarks or outline, so that machinery is switched off on its canvas
+class _ReportCanvas(Canvas):
+    def bookmarkPage(self, *args, **kwargs):
+        return
+
+    def addOutlineEntry(self, *args, **kwargs):
+        return
+
+# Main PDF generation function
+def generate_pdf_report(calculation_data, total_weight, cage_type, project_name, project_number, cage_designation):
+    """Generate a professional PDF report with company branding and header on all pages."""
+    # The date and logo are part of the cache key, so a cached report never outlives
+    # the day it was dated or a logo that was missing when it was built
+    return _render_pdf_report(calculation_data, total_weight, cage_type, project_name, project_number,
+                              cage_designation, _today_str(datetime.now().toordinal()), get_logo_bytes())
+
+# Cached by Streamlit, so identical inputs skip the ReportLab build
+@st.cache_data(show_spinner=False, max_entries=16)
+def _render_pdf_report(calculation_data, total_weight, cage_type, project_name, project_number,
+                       cage_designation, report_date, logo_bytes):
+    """
+    Builds the PDF report for generate_pdf_report.
+    Args:
+        report_date (str): Date printed in the project info.
+        logo_bytes (bytes): Company logo image, or None to omit it.
+        (The other arguments are those of generate_pdf_report.)
+    Returns:
+        bytes: The PDF document.
+    """
+    elements = []
+
+    # ImageReader decodes the logo once and is reused on every page
+    logo = None
+    if logo_bytes:
+        try:
+            logo = ImageReader(io.BytesIO(logo_bytes))
+        except Exception:
+            pass # Ignore if the logo cannot be read
+    draw_header_footer = functools.partial(_draw_header_footer, logo=logo)
+    
+    # Title and project info
+    elements.append(_TITLE_PARAGRAPH)
+    elements.append(Paragraph(f"for {cage_type}", _SUBTITLE_STYLE))
+    
+    # Project Info
+    project_info_text = (
+        f"<b>Project:</b> {project_name}<br/>"
+        f"<b>Number:</b> {project_number}<br/>"
+        f"<b>Cage Designation:</b> {cage_designation}<br/>" # Added Cage Designation
+        f"<b>Date:</b> {report_date}"
+    )
+    elements.append(Paragraph(project_info_text, _NORMAL_STYLE))
+    elements.append(Spacer(1, 8*mm))
+    
+    # --- Introduction Section ---
+    elements.append(_INTRO_HEADING)
+    elements.append(_INTRO_PARAGRAPH)
+    elements.append(Spacer(1, 4*mm))
+
+    # Format the values one column at a time (one format spec per column, no per-cell lookups);
+    # the input and summary tables share these strings
+    columns = list(zip(*calculation_data)) or [()] * 7
+    components, bar_sizes, quantities, lengths, total_lengths, unit_weights, total_weights = columns
+    formatted_rows = list(zip(
+        components,
+        bar_sizes,
+        map(str, quantities),
+        map("{:.2f}".format, lengths),
+        map("{:.2f}".format, total_lengths),
+        map("{:.3f}".format, unit_weights),
+        map("{:.2f}".format, total_weights)
+    ))
+
+    # --- Input Details Section ---
+    elements.append(_INPUT_HEADING)
+    
+    input_data_table_content = [_INPUT_HEADER_ROW[:]]
+
+    # Both tables are built from the calculation rows; only the component column can wrap,
+    # short values are plain strings styled by the TableStyle
+    for component, bar_size, quantity, length, *_ in formatted_rows:
+        input_data_table_content.append([_component_cell(component), bar_size, quantity, length])
+    
+    if len(input_data_table_content) > 1: # Check if there's actual data beyond headers
+        elements.extend(_split_table(input_data_table_content, [60*mm, 35*mm, 35*mm, 40*mm], _INPUT_TABLE_STYLE))
+    else:
+        elements.append(_NO_INPUT_PARAGRAPH)
+
+    elements.append(Spacer(1, 8*mm))
+    
+    # --- Weight Calculation Summary Section ---
+    elements.append(_SUMMARY_HEADING)
+    
+    if calculation_data:
+        # Prepare data for the table
+        table_data = [_SUMMARY_HEADER_ROW[:]]
+        
+        for component, *values in formatted_rows:
+            table_data.append([_component_cell(component), *values])
+            
+        elements.extend(_split_table(table_data, [40*mm, 20*mm, 20*mm, 25*mm, 25*mm, 25*mm, 25*mm], _SUMMARY_TABLE_STYLE))
+        elements.append(Spacer(1, 6*mm))
+        elements.append(Paragraph(f"**Total Estimated {cage_type} Weight: {total_weight:.2f} kg**", _HEADING2_STYLE))
+    else:
+        elements.append(_NO_BARS_PARAGRAPH)
+
+    # Build the document with header and footer on all pages
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
+                            leftMargin=_LEFT_MARGIN, rightMargin=_RIGHT_MARGIN,
+                            topMargin=_TOP_MARGIN, bottomMargin=_BOTTOM_MARGIN)
+    with _BUILD_LOCK:
+        doc.build(elements, onFirstPage=draw_header_footer, onLaterPages=draw_header_footer,
+                  canvasmaker=_ReportCanvas)
+    return buffer.getvalue()